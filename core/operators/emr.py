@@ -5,6 +5,7 @@ from settings.config import (
     AWS_REGION,
     AWS_ROLE,
     EMR_CONFIG,
+    S3_CODE_ARCHIVE,
     S3_CODE_BUCKET,
 )
 
@@ -13,8 +14,11 @@ logger = log.setup_custom_logger(__name__)
 
 class EMROperator:
 
-    def __init__(self):
+    def __init__(self, session=None):
 
+        self.session = session or boto3.session.Session(
+            region_name=AWS_REGION,
+        )
         self.client = self.create_emr_client()
 
     def create_emr_client(self):
@@ -26,7 +30,7 @@ class EMROperator:
             boto3.client
         """
 
-        client = boto3.client('emr', region_name=AWS_REGION)
+        client = self.session.client('emr')
         logger.info('Client created')
 
         return client
@@ -106,9 +110,22 @@ class EMROperator:
                             'aws',
                             's3',
                             'cp',
-                            f's3://{S3_CODE_BUCKET}',
+                            f's3://{S3_CODE_BUCKET}/{S3_CODE_ARCHIVE}',
+                            '/home/hadoop/',
+                        ]
+                    }
+                },
+                {
+                    'Name': 'Extract application code',
+                    'ActionOnFailure': 'CANCEL_AND_WAIT',
+                    'HadoopJarStep': {
+                        'Jar': 'command-runner.jar',
+                        'Args': [
+                            'unzip',
+                            '-o',
+                            f'/home/hadoop/{S3_CODE_ARCHIVE}',
+                            '-d',
                             '/home/hadoop/',
-                            '--recursive'
                         ]
                     }
                 },
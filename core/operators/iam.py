@@ -16,8 +16,11 @@ logger = log.setup_custom_logger(__name__)
 
 class IAMOperator:
 
-    def __init__(self):
+    def __init__(self, session=None):
 
+        self.session = session or boto3.session.Session(
+            region_name=AWS_REGION,
+        )
         self.aws_role_policies = [EMR_FULL_ACCESS]
         self.dwh_db_role = AWS_ROLE
         self.dwh_trust_policy = EMR_TRUST_RELATIONSHIP
@@ -41,7 +44,7 @@ class IAMOperator:
         Returns:
             boto3.client
         """
-        client = boto3.client(service_name='iam', region_name=AWS_REGION)
+        client = self.session.client(service_name='iam')
         logger.info('Client created')
 
         return client
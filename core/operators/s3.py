@@ -1,24 +1,82 @@
 import boto3
-import glob
+import hashlib
+import io
 import os
+import zipfile
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
 import core.logger.log as log
-from settings.config import AWS_REGION
+from settings.config import AWS_REGION, S3_CODE_ARCHIVE
 
 logger = log.setup_custom_logger(__name__)
 
 
+SOURCE_EXTENSIONS = frozenset(('cfg', 'py'))
+
+
+def _iter_source_files(root, exts=SOURCE_EXTENSIONS):
+    """
+    Recursively walks the specified directory with os.scandir and yields the
+    path of each file matching one of the specified extensions.
+
+    Args:
+        root (str):
+            The directory to walk.
+
+        exts (frozenset):
+            File extensions, without the leading dot, to filter the results
+            by.
+
+    Yields:
+        str
+    """
+    stack = [root]
+
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+
+                name = entry.name
+                idx = name.rfind('.')
+
+                if (idx != -1
+                        and name[idx + 1:] in exts
+                        and entry.is_file(follow_symlinks=False)):
+                    yield entry.path
+
+
 class S3Operator:
 
-    def __init__(self):
+    def __init__(self, session=None):
 
+        self.session = session or boto3.session.Session(
+            region_name=AWS_REGION,
+        )
         self.client = self.create_s3_client()
+        self.transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=8,
+            use_threads=True,
+        )
 
     def create_s3_client(self):
         """
         Creates a client with the AWS credentials configured in the AWS CLI.
+        The connection pool is sized for concurrent requests and retries back
+        off adaptively when S3 throttles the client.
         """
-        client = boto3.client('s3', region_name=AWS_REGION)
+        config = Config(
+            max_pool_connections=32,
+            retries={'mode': 'adaptive', 'max_attempts': 5},
+            tcp_keepalive=True,
+        )
+        client = self.session.client('s3', config=config)
         logger.info('Client created')
 
         return client
@@ -34,47 +92,77 @@ class S3Operator:
                 Bucket=bucket,
                 CreateBucketConfiguration={'LocationConstraint': AWS_REGION}
             )
-            logger.info(f'{bucket} created')
+            logger.info('%s created', bucket)
 
         except self.client.exceptions.BucketAlreadyOwnedByYou:
-            logger.info(
-                f"'{bucket}' already exists!"
-            )
+            logger.info("'%s' already exists!", bucket)
 
-    def deploy_code(self, bucket):
+    def deploy_code(self, bucket, key=S3_CODE_ARCHIVE):
         """
-        Deploys the application code to the specified S3 bucket. When the
-        EMR cluster is created, the code is copied from the S3 bucket to the
-        local disk of the master node and executed there.
+        Deploys the application code to the specified S3 bucket as a single
+        zip archive. When the EMR cluster is created, the archive is copied
+        from the S3 bucket to the local disk of the master node, extracted
+        and executed there. Large archives are uploaded in concurrent
+        multipart chunks, and the upload is skipped if the archive is
+        unchanged since the previous deployment.
 
         Args:
             bucket (str):
                 The name of the S3 bucket to deploy the application to.
+
+            key (str):
+                The object key to write the zip archive to.
         """
-        directory = f'{os.path.join(os.getcwd())}{os.sep}'
-        extensions = ('cfg', 'py')
+        directory = f'{os.getcwd()}{os.sep}'
+        directory_len = len(directory)
+        buffer = io.BytesIO()
 
         try:
-            for ext in extensions:
+            with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+                for path in _iter_source_files(directory):
+                    # zipfile converts os.sep to '/' in archive names
+                    arcname = path[directory_len:]
+
+                    archive.write(path, arcname=arcname)
+                    logger.info('%s added to %s', arcname, key)
+
+            body = buffer.getvalue()
+
+            if not self._needs_upload(bucket, key, body):
+                logger.info('%s unchanged, skipped', key)
+                return
+
+            buffer.seek(0)
+            self.client.upload_fileobj(
+                buffer,
+                bucket,
+                key,
+                Config=self.transfer_config,
+            )
+            logger.info('%s written to S3', key)
+
+        except Exception as e:
+            raise(e)
 
-                for root, subdirs, files in os.walk(directory):
-                    files = glob.glob(os.path.join(root, f'*.{ext}'))
+    def _needs_upload(self, bucket, key, body):
+        """
+        Compares the MD5 hash of the specified content with the ETag of the
+        object at the specified key. The ETag of an object uploaded in a
+        single part is the MD5 hash of its content; multipart ETags never
+        match, so those objects are always uploaded.
 
-                    for f in files:
-                        relative_path = root.replace(directory, '')
-                        filename = os.path.basename(f)
-                        s3_path = os.path.join(relative_path, filename)
-                        s3_path = s3_path.replace(os.sep, '/')
+        Returns:
+            bool
+        """
+        try:
+            head = self.client.head_object(Bucket=bucket, Key=key)
 
-                        self.client.upload_file(
-                            os.path.join(root, f),
-                            bucket,
-                            s3_path,
-                        )
-                        logger.info(f'{s3_path} written to S3')
+        except ClientError as e:
+            if e.response['Error']['Code'] == '404':
+                return True
+            raise
 
-        except Exception as e:
-            raise(e)
+        return head['ETag'].strip('"') != hashlib.md5(body).hexdigest()
 
     def list_bucket(self, bucket, prefix=''):
         """
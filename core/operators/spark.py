@@ -33,7 +33,7 @@ class SparkOperator:
         for colname in df.columns:
             df = df.withColumn(
                 colname,
-                f.when(f.col(colname) == r'^\s*$', None)
+                f.when(f.length(f.col(colname)) == 0, None)
                 .otherwise(f.col(colname))
             )
 
@@ -62,6 +62,21 @@ class SparkOperator:
                 '.allowCreatingManagedTableUsingNonemptyLocation',
                 'true',
             )
+            .config('spark.sql.parquet.compression.codec', 'snappy')
+            .config('spark.sql.parquet.filterPushdown', 'true')
+            .config('spark.sql.parquet.enableVectorizedReader', 'true')
+            .config('spark.sql.autoBroadcastJoinThreshold', 100 * 1024 * 1024)
+            # a lower open cost packs more small json files into each task
+            .config('spark.sql.files.openCostInBytes', 1024 * 1024)
+            .config('spark.hadoop.fs.s3a.fast.upload', 'true')
+            .config('spark.sql.adaptive.enabled', 'true')
+            .config('spark.sql.adaptive.coalescePartitions.enabled', 'true')
+            .config('spark.sql.adaptive.skewJoin.enabled', 'true')
+            .config('spark.sql.adaptive.advisoryPartitionSizeInBytes', '128MB')
+            .config(
+                'spark.sql.adaptive.shuffle.targetPostShuffleInputSize',
+                '128MB',
+            )
             .getOrCreate())
 
         return session
@@ -98,7 +113,8 @@ class SparkOperator:
         """
         Reads input data files with the specified path and extension into a
         PySpark DataFrame. The specified SQL query is excuted to clean the
-        data and the result is returned as a new DataFrame.
+        data and the result is returned as a new DataFrame. A schema must be
+        provided, as inferring it requires an additional pass over the data.
 
         Args:
             input_data (str) | (list):
@@ -116,7 +132,11 @@ class SparkOperator:
         Returns:
             pyspark.DataFrame
         """
-        df = self.session.read.json(input_data, schema)
+        if schema is None:
+            raise ValueError(f'No schema provided for {table_name}')
+
+        logger.info(f'Schema: {table_name} \n{schema.simpleString()}')
+        df = self.session.read.schema(schema).json(input_data)
         df = self.clean_dataframe(df)
         df = self.execute_sql(df=df, query=query)
 
@@ -133,8 +153,11 @@ class SparkOperator:
                             *args,
                             **kwargs):
         """
-        Writes a DataFrame to the specified path as parquet files, partitioned
-        by the specified columns. If no partition is provided, the output will
+        Writes a DataFrame to the specified path as snappy compressed,
+        dictionary encoded parquet files, partitioned by the specified
+        columns. The DataFrame is repartitioned by the same columns before
+        writing, so each partition directory receives a single file rather
+        than one file per task. If no partition is provided, the output will
         be coalesced to a single partition.
 
         Args:
@@ -154,15 +177,17 @@ class SparkOperator:
                 The write mode of the DataFrame writer.
         """
         if partition:
-            (df.repartition(*partition)
-               .write
-               .mode(mode)
-               .partitionBy(*partition)
-               .parquet(os.path.join(output_path, table_name)))
+            writer = (df.repartition(*partition)
+                        .write
+                        .partitionBy(*partition))
         else:
-            (df.coalesce(1)
-               .write
-               .mode(mode)
+            writer = df.coalesce(1).write
+
+        (writer.mode(mode)
+               .option('compression', 'snappy')
+               .option('parquet.block.size', 128 * 1024 * 1024)
+               .option('parquet.page.size', 1024 * 1024)
+               .option('parquet.enable.dictionary', 'true')
                .parquet(os.path.join(output_path, table_name)))
 
         logger.info(
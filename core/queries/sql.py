@@ -1,7 +1,6 @@
-def stage_log_data():
-
-    name = 'stage_log_data'
-    sql = (
+STAGE_LOG_DATA = {
+    'name': 'stage_log_data',
+    'sql': (
         """
         SELECT CAST(artist AS STRING)     AS artist,
                CAST(auth AS STRING)       AS auth,
@@ -27,15 +26,13 @@ def stage_log_data():
                CAST(userId AS BIGINT)     AS user_id
         FROM stage
         """
-    )
-
-    return {'name': name, 'sql': sql}
+    ),
+}
 
 
-def stage_song_data():
-
-    name = 'stage_song_data'
-    sql = (
+STAGE_SONG_DATA = {
+    'name': 'stage_song_data',
+    'sql': (
         """
         SELECT CAST(num_songs AS INT)           AS num_songs,
                CAST(artist_id AS STRING)        AS artist_id,
@@ -49,15 +46,13 @@ def stage_song_data():
                CAST(year AS SMALLINT)           AS year
         FROM stage
         """
-    )
-
-    return {'name': name, 'sql': sql}
+    ),
+}
 
 
-def create_dim_artists():
-
-    name = 'create_dim_artists'
-    sql = (
+CREATE_DIM_ARTISTS = {
+    'name': 'create_dim_artists',
+    'sql': (
         """
         WITH t1 AS (
             SELECT *,
@@ -77,15 +72,13 @@ def create_dim_artists():
               AND t1.rn = 1
         ORDER BY 1
         """
-    )
-
-    return {'name': name, 'sql': sql}
-
+    ),
+}
 
-def create_dim_songs():
 
-    name = 'create_dim_songs'
-    sql = (
+CREATE_DIM_SONGS = {
+    'name': 'create_dim_songs',
+    'sql': (
         """
         SELECT DISTINCT song_id     AS song_id,
                         title       AS title,
@@ -100,37 +93,38 @@ def create_dim_songs():
         WHERE song_id IS NOT NULL
         ORDER BY 1
         """
-    )
+    ),
+}
 
-    return {'name': name, 'sql': sql}
 
-
-def create_dim_time():
-
-    name = 'create_dim_time'
-    sql = (
+CREATE_DIM_TIME = {
+    'name': 'create_dim_time',
+    'sql': (
         """
-        SELECT DISTINCT ts             AS start_time,
-                        HOUR(ts)       AS hour,
-                        DAYOFMONTH(ts) AS day,
-                        DAYOFWEEK(ts)  AS weekday,
-                        WEEKOFYEAR(ts) AS week,
-                        MONTH(ts)      AS month,
-                        YEAR(ts)       AS year
-        FROM stage
-        WHERE ts IS NOT NULL
-            AND page = 'NextSong'
+        WITH t1 AS (
+            SELECT DISTINCT ts,
+                            CAST(ts AS TIMESTAMP) AS ts_parsed
+            FROM stage
+            WHERE ts IS NOT NULL
+                AND page = 'NextSong'
+        )
+        SELECT ts                    AS start_time,
+               HOUR(ts_parsed)       AS hour,
+               DAYOFMONTH(ts_parsed) AS day,
+               DAYOFWEEK(ts_parsed)  AS weekday,
+               WEEKOFYEAR(ts_parsed) AS week,
+               MONTH(ts_parsed)      AS month,
+               YEAR(ts_parsed)       AS year
+        FROM t1
         ORDER BY 1
         """
-    )
-
-    return {'name': name, 'sql': sql}
+    ),
+}
 
 
-def create_dim_users():
-
-    name = 'create_dim_users'
-    sql = (
+CREATE_DIM_USERS = {
+    'name': 'create_dim_users',
+    'sql': (
         """
         SELECT DISTINCT t1.user_id    AS user_id,
                         t1.first_name AS first_name,
@@ -147,17 +141,16 @@ def create_dim_users():
             )
         ORDER BY 1
         """
-    )
-
-    return {'name': name, 'sql': sql}
+    ),
+}
 
 
-def create_fact_songplays():
-
-    name = 'create_fact_songplays'
-    sql = (
+CREATE_FACT_SONGPLAYS = {
+    'name': 'create_fact_songplays',
+    'sql': (
         """
-        SELECT MONOTONICALLY_INCREASING_ID()
+        SELECT /*+ BROADCAST(t2) */
+               MONOTONICALLY_INCREASING_ID()
                              AS songplay_id,
                t1.ts         AS start_time,
                YEAR(t1.ts)   AS year,
@@ -177,37 +170,35 @@ def create_fact_songplays():
             AND t1.ts IS NOT NULL
         ORDER BY 1
         """
-    )
-
-    return {'name': name, 'sql': sql}
-
+    ),
+}
 
-def profile_query(key):
-
-    name = 'profile_query'
-    sql = (
-        f"""
-        SELECT
-            {key},
-            COUNT(*)
-        FROM stage
-        GROUP BY 1
-        HAVING COUNT(*) > 1
-        """
-    )
-
-    return {'name': name, 'sql': sql}
 
+PROFILE_QUERIES = {
+    key: {
+        'name': 'profile_query',
+        'sql': (
+            f"""
+            SELECT
+                {key},
+                COUNT(*)
+            FROM stage
+            GROUP BY 1
+            HAVING COUNT(*) > 1
+            """
+        ),
+    }
+    for key in ('artist_id', 'song_id', 'user_id')
+}
 
-def songplay_test_query():
 
-    name = 'songplay_test_query'
-    sql = (
+SONGPLAY_TEST_QUERY = {
+    'name': 'songplay_test_query',
+    'sql': (
         """
         SELECT *
         FROM stage
         WHERE song_id IS NOT NULL
         """
-    )
-
-    return {'name': name, 'sql': sql}
+    ),
+}
@@ -1,24 +1,41 @@
+import boto3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from core.operators.emr import EMROperator
 from core.operators.iam import IAMOperator
 from core.operators.s3 import S3Operator
-from settings.config import S3_CODE_BUCKET, S3_DATA_LAKE, S3_LOGS
+from settings.config import (
+    AWS_REGION,
+    S3_CODE_BUCKET,
+    S3_DATA_LAKE,
+    S3_LOGS,
+)
 
 
 def main():
 
-    # instantiate aws clients
-    iam = IAMOperator()
-    emr = EMROperator()
-    s3 = S3Operator()
+    # instantiate aws clients from a shared session
+    session = boto3.session.Session(region_name=AWS_REGION)
+    iam = IAMOperator(session=session)
+    emr = EMROperator(session=session)
+    s3 = S3Operator(session=session)
+
+    # create aws role and buckets concurrently, they are independent
+    with ThreadPoolExecutor() as executor:
+        futures = [
+            executor.submit(iam.create_role),
+            executor.submit(s3.create_bucket, bucket=S3_CODE_BUCKET),
+            executor.submit(s3.create_bucket, bucket=S3_DATA_LAKE),
+            executor.submit(s3.create_bucket, bucket=S3_LOGS),
+        ]
+
+        for future in as_completed(futures):
+            future.result()
 
     # setup aws policies
-    iam.create_role()
     iam.attach_role_policies()
 
     # deploy aws infrastructure
-    s3.create_bucket(bucket=S3_CODE_BUCKET)
-    s3.create_bucket(bucket=S3_DATA_LAKE)
-    s3.create_bucket(bucket=S3_LOGS)
     s3.deploy_code(bucket=S3_CODE_BUCKET)
     emr.create_emr_cluster()
 
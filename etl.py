@@ -1,18 +1,18 @@
-import glob
+import logging
 import os
 
 import core.logger.log as log
 from core.operators.spark import SparkOperator
 from core.queries.sql import (
-    create_dim_artists,
-    create_dim_songs,
-    create_dim_time,
-    create_dim_users,
-    create_fact_songplays,
-    profile_query,
-    songplay_test_query,
-    stage_log_data,
-    stage_song_data,
+    CREATE_DIM_ARTISTS,
+    CREATE_DIM_SONGS,
+    CREATE_DIM_TIME,
+    CREATE_DIM_USERS,
+    CREATE_FACT_SONGPLAYS,
+    PROFILE_QUERIES,
+    SONGPLAY_TEST_QUERY,
+    STAGE_LOG_DATA,
+    STAGE_SONG_DATA,
 )
 from core.schema.json import schema_log_data, schema_song_data
 from settings.config import (
@@ -26,8 +26,10 @@ logger = log.setup_custom_logger(__name__)
 
 def get_filepaths(filepath, extension):
     """
-    Walks over the specified directory and returns a list of filepaths
-    matching the specified extension.
+    Walks over the specified directory and yields the absolute filepaths
+    matching the specified extension. As with os.walk and glob, directories
+    which cannot be listed are skipped and hidden files are not matched, so
+    a missing directory yields nothing.
 
     Args:
         filepath (str):
@@ -36,17 +38,49 @@ def get_filepaths(filepath, extension):
         extension (str):
             File extension to filter the results by.
 
-    Returns:
-        list
+    Yields:
+        str
+    """
+    stack = [os.path.abspath(filepath)]
+    dot_extension = f'.{extension}'
+
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif (entry.name.endswith(dot_extension)
+                      and not entry.name.startswith('.')
+                      and entry.is_file(follow_symlinks=False)):
+                    yield entry.path
+
+
+def run_profiling_query(spark, df, query):
     """
-    filepaths = []
+    Executes a profiling query on the specified DataFrame and logs the first
+    row of the result. Profiling queries trigger a Spark job of their own, so
+    they are only run when the logger is set to DEBUG level.
+
+    Args:
+        spark (pyspark.SparkSession):
+            A PySpark session configured to run on AWS EMR.
 
-    for root, dirs, files in os.walk(filepath):
-        files = glob.glob(os.path.join(root, f'*.{extension}'))
-        for f in files:
-            filepaths.append(os.path.abspath(f))
+        df (pyspark.DataFrame):
+            The PySpark DataFrame to profile.
+
+        query (dict):
+            The profiling query to execute on the DataFrame.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
 
-    return filepaths
+    rows = spark.execute_sql(df=df, query=query).limit(1).collect()
+    logger.debug('Profiling query: %s | result: %s', query['name'], rows)
 
 
 def process_song_data(spark, input_data, output_data):
@@ -64,24 +98,32 @@ def process_song_data(spark, input_data, output_data):
 
         output_data (str):
             The URI of the S3 bucket to write output files.
+
+    Returns:
+        pyspark.DataFrame
     """
 
     # get filepath for song data files
     input_data = os.path.join(input_data, 'song_data/*/*/*/*.json')
-    logger.info(f'Input data path: {input_data}')
+    logger.info('Input data path: %s', input_data)
 
     # read json data into a spark dataframe
     df = spark.stage_json_data(input_data=input_data,
                                schema=schema_song_data(),
-                               query=stage_song_data(),
+                               query=STAGE_SONG_DATA,
                                table_name='stage_song_data')
 
+    # cache staged data as it is queried more than once
+    df = df.cache()
+    df.count()
+
     # run sql query to create songs dimension
-    clean_df = spark.execute_sql(df=df, query=create_dim_songs())
+    clean_df = spark.execute_sql(df=df, query=CREATE_DIM_SONGS)
 
     # profiling query: check for duplicate song_id
-    spark.execute_sql(df=clean_df,
-                      query=profile_query(key='song_id')).show(1)
+    run_profiling_query(spark=spark,
+                        df=clean_df,
+                        query=PROFILE_QUERIES['song_id'])
 
     # write songs table to parquet files
     spark.write_parquet_files(df=clean_df,
@@ -90,17 +132,21 @@ def process_song_data(spark, input_data, output_data):
                               partition=('year', 'artist_name'))
 
     # run sql query to create artists dimension
-    clean_df = spark.execute_sql(df=df, query=create_dim_artists())
+    clean_df = spark.execute_sql(df=df, query=CREATE_DIM_ARTISTS)
 
     # profiling query: check for duplicate artist_id
-    spark.execute_sql(df=clean_df,
-                      query=profile_query(key='artist_id')).show(1)
+    run_profiling_query(spark=spark,
+                        df=clean_df,
+                        query=PROFILE_QUERIES['artist_id'])
 
     # write artists table to parquet files
     spark.write_parquet_files(df=clean_df,
                               output_path=output_data,
                               table_name='dim_artists')
 
+    # staged song data stays cached for the songplays join
+    return df
+
 
 def process_log_data(spark, input_data, output_data):
     """
@@ -121,20 +167,25 @@ def process_log_data(spark, input_data, output_data):
 
     # get filepath for log data files
     input_data = os.path.join(input_data, 'log_data/*/*/*.json')
-    logger.info(f'Input data path: {input_data}')
+    logger.info('Input data path: %s', input_data)
 
     # read json data into a spark dataframe
     df = spark.stage_json_data(input_data=input_data,
                                schema=schema_log_data(),
-                               query=stage_log_data(),
+                               query=STAGE_LOG_DATA,
                                table_name='stage_log_data')
 
+    # cache staged data as it is queried more than once
+    df = df.cache()
+    df.count()
+
     # run sql query to create users dimension
-    clean_df = spark.execute_sql(df=df, query=create_dim_users())
+    clean_df = spark.execute_sql(df=df, query=CREATE_DIM_USERS)
 
     # profiling query: check for duplicate user_id
-    spark.execute_sql(df=clean_df,
-                      query=profile_query(key='user_id')).show(1)
+    run_profiling_query(spark=spark,
+                        df=clean_df,
+                        query=PROFILE_QUERIES['user_id'])
 
     # write users table to parquet files
     spark.write_parquet_files(df=clean_df,
@@ -142,7 +193,7 @@ def process_log_data(spark, input_data, output_data):
                               table_name='dim_users')
 
     # run sql query to create time dimension
-    clean_df = spark.execute_sql(df=df, query=create_dim_time())
+    clean_df = spark.execute_sql(df=df, query=CREATE_DIM_TIME)
 
     # write time table to parquet files
     spark.write_parquet_files(df=clean_df,
@@ -151,11 +202,12 @@ def process_log_data(spark, input_data, output_data):
                               partition=('year', 'month'))
 
     # run sql query to create songplays fact table
-    clean_df = spark.execute_sql(df=df,  query=create_fact_songplays())
+    clean_df = spark.execute_sql(df=df,  query=CREATE_FACT_SONGPLAYS)
 
     # profiling query: show populated song_id (expecting one match)
-    spark.execute_sql(df=clean_df,
-                      query=songplay_test_query()).show(1)
+    run_profiling_query(spark=spark,
+                        df=clean_df,
+                        query=SONGPLAY_TEST_QUERY)
 
     # write fact table to parquet files
     spark.write_parquet_files(df=clean_df,
@@ -163,19 +215,23 @@ def process_log_data(spark, input_data, output_data):
                               table_name='fact_songplays',
                               partition=('year', 'month'))
 
+    df.unpersist()
+
 
 def main():
 
     spark = SparkOperator()
 
-    process_song_data(spark=spark,
-                      input_data=S3_INPUT_DATA,
-                      output_data=S3_OUTPUT_DATA)
+    song_df = process_song_data(spark=spark,
+                                input_data=S3_INPUT_DATA,
+                                output_data=S3_OUTPUT_DATA)
 
     process_log_data(spark=spark,
                      input_data=S3_INPUT_DATA,
                      output_data=S3_OUTPUT_DATA)
 
+    song_df.unpersist()
+
 
 if __name__ == "__main__":
     main()